@@ -0,0 +1,69 @@
+import os
+import gzip
+import shutil
+import asyncio
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .database import Database
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = "botguette-"
+SNAPSHOT_SUFFIX = ".db.gz"
+# On-demand snapshots rotate separately so running the command can't push out scheduled ones
+SCHEDULED = "scheduled"
+MANUAL = "manual"
+
+
+class BackupManager:
+    def __init__(self, database: Database, backup_dir: str, keep: int = 7):
+        self.database = database
+        self.backup_dir = Path(backup_dir)
+        self.keep = keep
+        self._lock = asyncio.Lock()
+
+    async def create_snapshot(self, kind: str = SCHEDULED) -> Path:
+        async with self._lock:
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+            snapshot_path = self.backup_dir / f"{SNAPSHOT_PREFIX}{kind}-{stamp}{SNAPSHOT_SUFFIX}"
+            raw_path = self.backup_dir / f".{SNAPSHOT_PREFIX}{kind}-{stamp}.db.tmp"
+
+            try:
+                await self.database.backup(str(raw_path))
+                await asyncio.to_thread(_compress, raw_path, snapshot_path)
+            finally:
+                raw_path.unlink(missing_ok=True)
+
+            await asyncio.to_thread(self._rotate, kind)
+            logger.info(f"Wrote database snapshot {snapshot_path}")
+            return snapshot_path
+
+    def snapshots(self, kind: str = SCHEDULED) -> list[Path]:
+        # Timestamps sort lexicographically, oldest first
+        return sorted(self.backup_dir.glob(f"{SNAPSHOT_PREFIX}{kind}-*{SNAPSHOT_SUFFIX}"))
+
+    def is_due(self, interval_hours: float) -> bool:
+        snapshots = self.snapshots(SCHEDULED)
+        if not snapshots:
+            return True
+        age = datetime.now(timezone.utc).timestamp() - snapshots[-1].stat().st_mtime
+        return age >= interval_hours * 3600
+
+    def _rotate(self, kind: str):
+        snapshots = self.snapshots(kind)
+        for snapshot in snapshots[:max(0, len(snapshots) - self.keep)]:
+            snapshot.unlink(missing_ok=True)
+            logger.info(f"Removed old database snapshot {snapshot}")
+
+
+def _compress(source: Path, destination: Path):
+    partial = destination.with_name(destination.name + ".part")
+    try:
+        with open(source, "rb") as src, gzip.open(partial, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(partial, destination)
+    finally:
+        partial.unlink(missing_ok=True)
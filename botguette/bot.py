@@ -1,15 +1,19 @@
 import os
+import time
 import asyncio
 import logging
 from uuid import UUID
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 import discord
 from discord import app_commands
 from discord.ext import tasks
 from urllib.parse import urlparse
 
-from .database import Database
-from .lobby_client import LobbyClient
+from .backup import MANUAL, BackupManager
+from .database import PINNED_PAGE_SIZE, Database, PinnedAnnouncement
+from .lobby_client import LobbyClient, RoomInfo
+from .resolver import Resolver
 
 logging.basicConfig(
     level=logging.INFO,
@@ -25,6 +29,8 @@ ANNOUNCEMENT_TEMPLATE = """{user_mention} is organizing an Archipelago **{game_t
 {role_mention}
 """
 
+WARM_START_CONCURRENCY = 10
+
 
 class ArchipelagoBot(discord.Client):
     def __init__(self):
@@ -33,6 +39,7 @@ class ArchipelagoBot(discord.Client):
         super().__init__(intents=intents)
 
         self.tree = app_commands.CommandTree(self)
+        self.resolver = Resolver(self)
 
         db_path = os.getenv("DATABASE_PATH", "botguette.db")
         self.database = Database(db_path)
@@ -48,6 +55,19 @@ class ArchipelagoBot(discord.Client):
         self.rate_limit_hours = int(os.getenv("RATE_LIMIT_HOURS", "1"))
         self.sync_role = os.environ["SYNC_ROLE"]
         self.async_role = os.environ["ASYNC_ROLE"]
+
+        backup_dir = os.getenv("BACKUP_DIR")
+        backup_keep = int(os.getenv("BACKUP_KEEP", "7"))
+        if backup_keep < 1:
+            raise ValueError("BACKUP_KEEP must be at least 1")
+        self.backup_manager = BackupManager(self.database, backup_dir, backup_keep) if backup_dir else None
+        self.backup_interval_hours = float(os.getenv("BACKUP_INTERVAL_HOURS", "24"))
+
+        self._started_at = time.monotonic()
+        self._warm_start_task: asyncio.Task | None = None
+        self._pins_cursor: tuple[str, int] | None = None
+        self.time_to_ready: float | None = None
+        self.time_to_first_refresh: float | None = None
         self._register_commands()
 
     def _register_commands(self):
@@ -75,6 +95,11 @@ class ArchipelagoBot(discord.Client):
         async def botguette_unban(interaction: discord.Interaction, user: discord.User):
             await self._handle_unban_command(interaction, user)
 
+        @self.tree.command(name="botguette-backup", description="Take a snapshot of the bot database")
+        @app_commands.default_permissions(administrator=True)
+        async def botguette_backup(interaction: discord.Interaction):
+            await self._handle_backup_command(interaction)
+
         @self.tree.command(name="pin", description="Pin a message in your async thread")
         @app_commands.describe(message_id="The ID of the message to pin")
         async def pin(interaction: discord.Interaction, message_id: str):
@@ -141,7 +166,7 @@ class ArchipelagoBot(discord.Client):
             return
 
         role_name = self.async_role if is_async else self.sync_role
-        role = discord.utils.get(interaction.guild.roles, name=role_name)
+        role = self.resolver.get_role(interaction.guild, role_name)
         if not role:
             await interaction.response.send_message(
                 f"Missing @{role_name} role. Ask an admin to create it.",
@@ -215,6 +240,23 @@ class ArchipelagoBot(discord.Client):
         await interaction.followup.send(f"Unbanned {user.mention}", ephemeral=True)
         logger.info(f"Unbanned {user_id}")
 
+    async def _handle_backup_command(self, interaction: discord.Interaction):
+        if not self.backup_manager:
+            await interaction.response.send_message("Backups are not configured.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            snapshot_path = await self.backup_manager.create_snapshot(MANUAL)
+        except Exception as e:
+            logger.error(f"Backup requested by {interaction.user.id} failed: {e}")
+            await interaction.followup.send("Backup failed.", ephemeral=True)
+            return
+
+        await interaction.followup.send(f"Backup written to `{snapshot_path.name}`", ephemeral=True)
+        logger.info(f"Backup requested by {interaction.user.id}")
+
     async def _handle_pin_command(self, interaction: discord.Interaction, message_id: str, pin: bool):
         action = "pin" if pin else "unpin"
 
@@ -266,6 +308,8 @@ class ArchipelagoBot(discord.Client):
 
     async def setup_hook(self):
         await self.database.initialize()
+        # Runs while commands sync and the gateway connects, the first cleanup pass picks up its results
+        self._warm_start_task = asyncio.create_task(self._warm_start())
 
         dev_guild_id = os.getenv("DEV_GUILD_ID")
         if dev_guild_id:
@@ -282,61 +326,196 @@ class ArchipelagoBot(discord.Client):
     async def on_ready(self):
         logger.info(f"Logged in as {self.user} (ID: {self.user.id})")
         logger.info("------")
-        self.cleanup_expired_pins.start()
+        if self.time_to_ready is None:
+            self.time_to_ready = time.monotonic() - self._started_at
+            logger.info(f"Ready in {self.time_to_ready:.2f}s")
+        # on_ready fires again on every reconnect
+        if not self.cleanup_expired_pins.is_running():
+            self.cleanup_expired_pins.start()
+        if self.backup_manager and not self.backup_database.is_running():
+            self.backup_database.start()
+
+    async def _warm_start(self) -> dict[tuple[str, int], tuple[discord.Message, RoomInfo | None]]:
+        semaphore = asyncio.Semaphore(WARM_START_CONCURRENCY)
+
+        async def fetch_room_info(pin: PinnedAnnouncement):
+            async with semaphore:
+                return await self.lobby_client.get_room_info(pin.lobby_url, pin.room_id)
+
+        async def fetch_message(pin: PinnedAnnouncement):
+            async with semaphore:
+                channel = await self.resolver.get_channel(pin.channel_id)
+                return await channel.fetch_message(pin.message_id)
+
+        # Only the first page, the pass streams the rest so its memory doesn't grow with the table
+        pins = []
+        try:
+            async for pin in self.database.iter_pinned_announcements():
+                pins.append(pin)
+                if len(pins) >= PINNED_PAGE_SIZE:
+                    break
+        except Exception as e:
+            logger.error(f"Warm start failed to load pinned announcements: {e}")
+            return {}
+
+        # The lobby doesn't depend on the gateway, but channels must come from the guild cache
+        room_infos = asyncio.gather(*(fetch_room_info(pin) for pin in pins), return_exceptions=True)
+        await self.wait_until_ready()
+        messages = await asyncio.gather(*(fetch_message(pin) for pin in pins), return_exceptions=True)
+
+        prefetched = {}
+        for pin, message, room_info in zip(pins, messages, await room_infos):
+            # Failures are left to the regular pass, which knows how to handle them
+            if not isinstance(message, BaseException) and not isinstance(room_info, BaseException):
+                prefetched[pin.cursor] = (message, room_info)
+
+        logger.info(f"Warm start prefetched {len(prefetched)}/{len(pins)} pinned announcements")
+        return prefetched
+
+    async def on_guild_available(self, guild: discord.Guild):
+        self.resolver.index_guild(guild)
+
+    async def on_guild_join(self, guild: discord.Guild):
+        self.resolver.index_guild(guild)
+
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.resolver.forget_guild(guild)
+
+    async def on_guild_role_create(self, role: discord.Role):
+        self.resolver.index_guild(role.guild)
+
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        self.resolver.index_guild(after.guild)
+
+    async def on_guild_role_delete(self, role: discord.Role):
+        self.resolver.index_guild(role.guild)
+
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        self.resolver.update_channel(after)
+
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        self.resolver.forget_channel(channel.id)
+
+    async def on_thread_update(self, before: discord.Thread, after: discord.Thread):
+        self.resolver.update_channel(after)
+
+    async def on_raw_thread_update(self, payload: discord.RawThreadUpdateEvent):
+        # Archived and fetched threads aren't in the guild cache, so on_thread_update never fires for them
+        if payload.thread:
+            return
+        guild = self.get_guild(payload.guild_id)
+        if guild:
+            self.resolver.update_channel(discord.Thread(guild=guild, state=self._connection, data=payload.data))
+        else:
+            self.resolver.forget_channel(payload.thread_id)
+
+    async def on_raw_thread_delete(self, payload: discord.RawThreadDeleteEvent):
+        self.resolver.forget_channel(payload.thread_id)
+
+    async def _refresh_announcement(self, message: discord.Message, room_info: RoomInfo, is_async: bool, thread_id: int | None, thread_message_id: int | None) -> list[str]:
+        diff = diff_announcement(message.content, room_info)
+        safe_room_name = sanitize_room_name(room_info.name)
+        updated = []
+
+        if diff.content:
+            role_name = self.async_role if is_async else self.sync_role
+            role = self.resolver.get_role(message.guild, role_name)
+            role_mention = role.mention if role else "<unknown>"
+            user_mention = message.mentions[0].mention if message.mentions else "<unknown>"
+            game_type = "async" if is_async else "sync"
+            new_content = ANNOUNCEMENT_TEMPLATE.format(
+                role_mention=role_mention,
+                user_mention=user_mention,
+                game_type=game_type,
+                room_name=safe_room_name,
+                room_url=room_info.url,
+                timestamp=int(room_info.close_date.timestamp())
+            )
+            await message.edit(content=new_content)
+            updated.append("content")
+
+        # The thread name and header only depend on the room name, so a date change never touches the thread
+        if diff.room_name and thread_id and thread_message_id:
+            thread = await self.resolver.get_channel(thread_id)
+
+            thread_name = room_info.name[:100]
+            if thread.name != thread_name:
+                # Thread.edit returns the updated thread and leaves the cached one untouched
+                self.resolver.update_channel(await thread.edit(name=thread_name))
+                updated.append("thread_name")
+
+            await thread.get_partial_message(thread_message_id).edit(content=f"**{safe_room_name}**\n{room_info.url}")
+            updated.append("thread_header")
+
+        return updated
 
     @tasks.loop(minutes=5)
     async def cleanup_expired_pins(self):
         logger.info("Checking for expired pins")
-        announcements = await self.database.get_pinned_announcements()
-
-        for room_id, guild_id, message_id, channel_id, lobby_url, is_async, thread_id, thread_message_id in announcements:
+        prefetched = {}
+        if self._warm_start_task:
+            prefetched = await self._warm_start_task
+            self._warm_start_task = None
+
+        # Resume after the last processed row if the previous pass was interrupted
+        async for pin in self.database.iter_pinned_announcements(after=self._pins_cursor):
+            room_id, guild_id = pin.room_id, pin.guild_id
             try:
-                channel = self.get_channel(channel_id)
-                if not channel:
-                    channel = await self.fetch_channel(channel_id)
-
-                message = await channel.fetch_message(message_id)
-                room_info = await self.lobby_client.get_room_info(lobby_url, room_id)
+                if pin.cursor in prefetched:
+                    message, room_info = prefetched.pop(pin.cursor)
+                else:
+                    channel = await self.resolver.get_channel(pin.channel_id)
+                    message = await channel.fetch_message(pin.message_id)
+                    room_info = await self.lobby_client.get_room_info(pin.lobby_url, room_id)
 
                 if not room_info or room_info.close_date < datetime.now(timezone.utc):
                     await message.unpin()
                     await self.database.clear_message_id(room_id, guild_id)
                     logger.info(f"Unpinned expired room {room_id}")
                 else:
-                    safe_room_name = sanitize_room_name(room_info.name)
-                    timestamp = int(room_info.close_date.timestamp())
-                    needs_update = f"<t:{timestamp}:F>" not in message.content or f"**{safe_room_name}**" not in message.content
-
-                    if needs_update:
-                        role_name = self.async_role if is_async else self.sync_role
-                        role = discord.utils.get(channel.guild.roles, name=role_name)
-                        role_mention = role.mention if role else "<unknown>"
-                        user_mention = message.mentions[0].mention if message.mentions else "<unknown>"
-                        game_type = "async" if is_async else "sync"
-                        new_content = ANNOUNCEMENT_TEMPLATE.format(
-                            role_mention=role_mention,
-                            user_mention=user_mention,
-                            game_type=game_type,
-                            room_name=safe_room_name,
-                            room_url=room_info.url,
-                            timestamp=timestamp
-                        )
-                        await message.edit(content=new_content)
-                        logger.info(f"Updated announcement for room {room_id}")
-
-                        if thread_id and thread_message_id:
-                            thread = self.get_channel(thread_id)
-                            if not thread:
-                                thread = await self.fetch_channel(thread_id)
-                            await thread.edit(name=room_info.name[:100])
-                            thread_msg = await thread.fetch_message(thread_message_id)
-                            await thread_msg.edit(content=f"**{safe_room_name}**\n{room_info.url}")
-                            logger.info(f"Updated thread for room {room_id}")
+                    updated = await self._refresh_announcement(message, room_info, pin.is_async, pin.thread_id, pin.thread_message_id)
+                    if updated:
+                        logger.info(f"Updated {', '.join(updated)} for room {room_id}")
             except discord.NotFound:
                 await self.database.clear_message_id(room_id, guild_id)
                 logger.info(f"Message deleted for room {room_id}, cleared from DB")
             except Exception as e:
                 logger.error(f"Failed to process pin for room {room_id}: {e}")
+            self._pins_cursor = pin.cursor
+
+        self._pins_cursor = None
+
+        if self.time_to_first_refresh is None:
+            self.time_to_first_refresh = time.monotonic() - self._started_at
+            logger.info(f"First full refresh done in {self.time_to_first_refresh:.2f}s")
+
+    # Checks hourly instead of sleeping a full interval so restarts neither skip nor pile up snapshots
+    @tasks.loop(hours=1)
+    async def backup_database(self):
+        if not self.backup_manager.is_due(self.backup_interval_hours):
+            return
+        try:
+            await self.backup_manager.create_snapshot()
+        except Exception as e:
+            logger.error(f"Scheduled backup failed: {e}")
+
+
+@dataclass
+class AnnouncementDiff:
+    timestamp: bool = False
+    room_name: bool = False
+
+    @property
+    def content(self) -> bool:
+        return self.timestamp or self.room_name
+
+
+def diff_announcement(content: str, room_info: RoomInfo) -> AnnouncementDiff:
+    timestamp = int(room_info.close_date.timestamp())
+    return AnnouncementDiff(
+        timestamp=f"<t:{timestamp}:F>" not in content,
+        room_name=f"**{sanitize_room_name(room_info.name)}**" not in content,
+    )
 
 
 def parse_room_url(url: str) -> tuple[str, str]:
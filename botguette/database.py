@@ -1,10 +1,31 @@
 import aiosqlite
 import logging
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+PINNED_PAGE_SIZE = 100
+BACKUP_PAGES_PER_STEP = 64
+
+
+@dataclass(slots=True)
+class PinnedAnnouncement:
+    room_id: str
+    guild_id: int
+    message_id: int
+    channel_id: int
+    lobby_url: str
+    is_async: bool
+    thread_id: int | None
+    thread_message_id: int | None
+
+    @property
+    def cursor(self) -> tuple[str, int]:
+        return self.room_id, self.guild_id
+
 
 class Database:
     def __init__(self, db_path: str = "botguette.db"):
@@ -46,6 +67,16 @@ class Database:
             await db.commit()
             logger.info("Database initialized")
 
+    async def backup(self, target_path: str, pages: int = BACKUP_PAGES_PER_STEP):
+        # Online backup, run entirely on the aiosqlite connection thread so the event loop stays free.
+        # Copying a few pages per step only holds the read lock briefly, sqlite only sleeps between steps
+        # when the database is busy or locked. Every other method writes through its own connection, so
+        # any write during the backup restarts it from the first page.
+        async with aiosqlite.connect(self.db_path) as db:
+            async with aiosqlite.connect(target_path, check_same_thread=False) as target:
+                await db.backup(target, pages=pages)
+        logger.info(f"Database backed up to {target_path}")
+
     async def is_user_banned(self, user_id: int) -> bool:
         async with aiosqlite.connect(self.db_path) as db:
             async with db.execute(
@@ -87,12 +118,26 @@ class Database:
             await db.commit()
             logger.info(f"Room {room_id} marked as announced in guild {guild_id} by user {user_id}")
 
-    async def get_pinned_announcements(self) -> list[tuple[str, int, int, int, str, bool, int, int]]:
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                "SELECT room_id, guild_id, message_id, channel_id, lobby_url, is_async, thread_id, thread_message_id FROM announced_rooms WHERE message_id IS NOT NULL"
-            ) as cursor:
-                return await cursor.fetchall()
+    async def iter_pinned_announcements(self, after: tuple[str, int] | None = None, page_size: int = PINNED_PAGE_SIZE) -> AsyncIterator[PinnedAnnouncement]:
+        # Keyset pagination over the primary key, each page holds a short-lived connection
+        cursor = after
+        while True:
+            async with aiosqlite.connect(self.db_path) as db:
+                if cursor is None:
+                    query = "SELECT room_id, guild_id, message_id, channel_id, lobby_url, is_async, thread_id, thread_message_id FROM announced_rooms WHERE message_id IS NOT NULL ORDER BY room_id, guild_id LIMIT ?"
+                    params = (page_size,)
+                else:
+                    query = "SELECT room_id, guild_id, message_id, channel_id, lobby_url, is_async, thread_id, thread_message_id FROM announced_rooms WHERE message_id IS NOT NULL AND (room_id, guild_id) > (?, ?) ORDER BY room_id, guild_id LIMIT ?"
+                    params = (*cursor, page_size)
+                async with db.execute(query, params) as db_cursor:
+                    rows = await db_cursor.fetchall()
+
+            for room_id, guild_id, message_id, channel_id, lobby_url, is_async, thread_id, thread_message_id in rows:
+                yield PinnedAnnouncement(room_id, guild_id, message_id, channel_id, lobby_url, bool(is_async), thread_id, thread_message_id)
+
+            if len(rows) < page_size:
+                return
+            cursor = rows[-1][0], rows[-1][1]
 
     async def clear_message_id(self, room_id: str, guild_id: int):
         async with aiosqlite.connect(self.db_path) as db:
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+import discord
+
+logger = logging.getLogger(__name__)
+
+
+# Kept up to date by the bot's gateway event handlers
+class Resolver:
+    def __init__(self, client: discord.Client):
+        self.client = client
+        self._roles: dict[int, dict[str, discord.Role]] = {}
+        self._channels: dict[int, discord.abc.GuildChannel | discord.Thread] = {}
+        self._pending_fetches: dict[int, asyncio.Task] = {}
+
+    def index_guild(self, guild: discord.Guild):
+        roles = {}
+        # guild.roles is ordered by position, keep the first match like discord.utils.get does
+        for role in guild.roles:
+            roles.setdefault(role.name, role)
+        self._roles[guild.id] = roles
+
+    def forget_guild(self, guild: discord.Guild):
+        self._roles.pop(guild.id, None)
+        self._channels = {
+            channel_id: channel for channel_id, channel in self._channels.items()
+            if channel.guild.id != guild.id
+        }
+
+    def get_role(self, guild: discord.Guild, name: str) -> discord.Role | None:
+        if guild.id not in self._roles:
+            self.index_guild(guild)
+        return self._roles[guild.id].get(name)
+
+    async def get_channel(self, channel_id: int) -> discord.abc.GuildChannel | discord.Thread:
+        channel = self._channels.get(channel_id)
+        if channel:
+            return channel
+
+        channel = self.client.get_channel(channel_id)
+        if not channel:
+            # Concurrent lookups of the same channel share a single fetch
+            fetch = self._pending_fetches.get(channel_id)
+            if not fetch:
+                fetch = asyncio.create_task(self.client.fetch_channel(channel_id))
+                self._pending_fetches[channel_id] = fetch
+                fetch.add_done_callback(lambda _: self._pending_fetches.pop(channel_id, None))
+            channel = await asyncio.shield(fetch)
+        self._channels[channel_id] = channel
+        return channel
+
+    def update_channel(self, channel: discord.abc.GuildChannel | discord.Thread):
+        if channel.id in self._channels:
+            self._channels[channel.id] = channel
+
+    def forget_channel(self, channel_id: int):
+        self._channels.pop(channel_id, None)
+        # Threads go away with their parent channel
+        self._channels = {
+            cached_id: channel for cached_id, channel in self._channels.items()
+            if getattr(channel, "parent_id", None) != channel_id
+        }
@@ -1,6 +1,8 @@
 """Pytest configuration for botguette tests."""
 import os
+import tempfile
 import pytest
+from botguette.database import Database
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -12,3 +14,17 @@ def setup_test_env():
     os.environ.setdefault("DISCORD_TOKEN", "test_token")
     os.environ.setdefault("SYNC_ROLE", "Archipelagoer")
     os.environ.setdefault("ASYNC_ROLE", "Archipelagoer")
+
+
+@pytest.fixture
+async def temp_db():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+
+    db = Database(path)
+    await db.initialize()
+
+    yield db
+
+    if os.path.exists(path):
+        os.unlink(path)
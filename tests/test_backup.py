@@ -0,0 +1,69 @@
+import gzip
+import sqlite3
+import os
+from unittest.mock import patch
+import pytest
+from botguette.backup import MANUAL, BackupManager
+
+
+async def test_create_snapshot(temp_db, tmp_path):
+    await temp_db.ban_user(123456789, "Test reason")
+    manager = BackupManager(temp_db, str(tmp_path / "backups"))
+
+    snapshot_path = await manager.create_snapshot()
+
+    assert manager.snapshots() == [snapshot_path]
+    restored_path = tmp_path / "restored.db"
+    with gzip.open(snapshot_path, "rb") as src:
+        restored_path.write_bytes(src.read())
+    with sqlite3.connect(restored_path) as restored:
+        assert restored.execute("SELECT user_id, reason FROM banned_users").fetchall() == [(123456789, "Test reason")]
+    assert list((tmp_path / "backups").glob(".*")) == []
+
+
+async def test_snapshot_rotation(temp_db, tmp_path):
+    backup_dir = tmp_path / "backups"
+    backup_dir.mkdir()
+    for stamp in ("20250101-000000", "20250102-000000", "20250103-000000"):
+        (backup_dir / f"botguette-scheduled-{stamp}.db.gz").write_bytes(b"")
+    manager = BackupManager(temp_db, str(backup_dir), keep=2)
+
+    snapshot_path = await manager.create_snapshot()
+
+    assert [path.name for path in manager.snapshots()] == ["botguette-scheduled-20250103-000000.db.gz", snapshot_path.name]
+
+
+async def test_failed_compression_leaves_no_partial(temp_db, tmp_path):
+    backup_dir = tmp_path / "backups"
+    manager = BackupManager(temp_db, str(backup_dir))
+
+    with patch("botguette.backup.shutil.copyfileobj", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            await manager.create_snapshot()
+
+    assert list(backup_dir.iterdir()) == []
+
+
+async def test_is_due(temp_db, tmp_path):
+    manager = BackupManager(temp_db, str(tmp_path / "backups"))
+    assert manager.is_due(24)
+
+    snapshot_path = await manager.create_snapshot()
+    assert not manager.is_due(24)
+
+    two_days_ago = snapshot_path.stat().st_mtime - 48 * 3600
+    os.utime(snapshot_path, (two_days_ago, two_days_ago))
+    assert manager.is_due(24)
+
+
+async def test_manual_snapshots_rotate_separately(temp_db, tmp_path):
+    manager = BackupManager(temp_db, str(tmp_path / "backups"), keep=1)
+    scheduled_path = await manager.create_snapshot()
+    two_days_ago = scheduled_path.stat().st_mtime - 48 * 3600
+    os.utime(scheduled_path, (two_days_ago, two_days_ago))
+
+    manual_path = await manager.create_snapshot(MANUAL)
+
+    assert manager.snapshots() == [scheduled_path]
+    assert manager.snapshots(MANUAL) == [manual_path]
+    assert manager.is_due(24)
@@ -1,5 +1,24 @@
 import pytest
-from botguette.bot import parse_room_url, sanitize_room_name
+import discord
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from botguette.bot import ArchipelagoBot, diff_announcement, parse_room_url, sanitize_room_name
+from botguette.database import PinnedAnnouncement
+from botguette.lobby_client import RoomInfo
+
+
+def make_room_info(name="Test Room", close_date=datetime(2025, 9, 20, 12, 0, tzinfo=timezone.utc)):
+    return RoomInfo(
+        id="0755761d-bca9-46c2-8dd6-a6d03200ef66",
+        name=name,
+        close_date=close_date,
+        description="Test description",
+        url="https://ap-lobby.bananium.fr/room/0755761d-bca9-46c2-8dd6-a6d03200ef66",
+    )
+
+
+def make_content(room_info):
+    return f"**{sanitize_room_name(room_info.name)}** <t:{int(room_info.close_date.timestamp())}:F>"
 
 
 def test_parse_room_url_valid():
@@ -51,3 +70,193 @@ def test_sanitize_room_name_clean():
 
 def test_sanitize_room_name_multiple_at():
     assert sanitize_room_name("@user1 and @user2") == "\\@user1 and \\@user2"
+
+
+def test_diff_announcement_unchanged():
+    room_info = make_room_info()
+    diff = diff_announcement(make_content(room_info), room_info)
+    assert not diff.timestamp
+    assert not diff.room_name
+    assert not diff.content
+
+
+def test_diff_announcement_timestamp_only():
+    content = make_content(make_room_info())
+    diff = diff_announcement(content, make_room_info(close_date=datetime(2025, 9, 21, 12, 0, tzinfo=timezone.utc)))
+    assert diff.timestamp
+    assert not diff.room_name
+    assert diff.content
+
+
+def test_diff_announcement_room_name():
+    content = make_content(make_room_info())
+    diff = diff_announcement(content, make_room_info(name="Renamed @Room"))
+    assert not diff.timestamp
+    assert diff.room_name
+    assert diff.content
+
+
+def make_message(room_info):
+    message = MagicMock()
+    message.content = make_content(room_info)
+    message.mentions = []
+    message.guild.roles = []
+    message.edit = AsyncMock()
+    return message
+
+
+def make_thread(name):
+    thread = MagicMock()
+    thread.name = name
+    thread.edit = AsyncMock()
+    thread.get_partial_message.return_value.edit = AsyncMock()
+    return thread
+
+
+async def test_refresh_announcement_timestamp_skips_thread():
+    bot = ArchipelagoBot()
+    bot.get_channel = MagicMock()
+    message = make_message(make_room_info())
+
+    room_info = make_room_info(close_date=datetime(2025, 9, 21, 12, 0, tzinfo=timezone.utc))
+    updated = await bot._refresh_announcement(message, room_info, True, 1, 2)
+
+    assert updated == ["content"]
+    message.edit.assert_awaited_once()
+    bot.get_channel.assert_not_called()
+
+
+async def test_refresh_announcement_rename_updates_thread():
+    bot = ArchipelagoBot()
+    thread = make_thread("Test Room")
+    bot.get_channel = MagicMock(return_value=thread)
+    message = make_message(make_room_info())
+
+    updated = await bot._refresh_announcement(message, make_room_info(name="New Room"), True, 1, 2)
+
+    assert updated == ["content", "thread_name", "thread_header"]
+    thread.edit.assert_awaited_once_with(name="New Room")
+    thread.get_partial_message.assert_called_once_with(2)
+
+
+async def test_refresh_announcement_same_thread_name_skips_rename():
+    bot = ArchipelagoBot()
+    thread = make_thread("Game @here")
+    bot.get_channel = MagicMock(return_value=thread)
+    message = make_message(make_room_info(name="Game @here"))
+    # Content written before sanitization existed, the thread name is already correct
+    message.content = message.content.replace("\\@", "@")
+
+    updated = await bot._refresh_announcement(message, make_room_info(name="Game @here"), True, 1, 2)
+
+    assert updated == ["content", "thread_header"]
+    thread.edit.assert_not_awaited()
+
+
+async def test_warm_start_prefetches_pinned_announcements():
+    bot = ArchipelagoBot()
+    room_info = make_room_info()
+    message = make_message(room_info)
+    channel = MagicMock()
+    channel.fetch_message = AsyncMock(return_value=message)
+    pins = [
+        PinnedAnnouncement("room-1", 1, 10, 100, "https://ap-lobby.bananium.fr", False, None, None),
+        PinnedAnnouncement("room-2", 1, 20, 200, "https://ap-lobby.bananium.fr", False, None, None),
+    ]
+
+    async def iter_pinned_announcements(after=None):
+        for pin in pins:
+            yield pin
+
+    bot.database.iter_pinned_announcements = iter_pinned_announcements
+    bot.resolver.get_channel = AsyncMock(side_effect=lambda channel_id: channel if channel_id == 100 else None)
+    bot.lobby_client.get_room_info = AsyncMock(return_value=room_info)
+    bot.wait_until_ready = AsyncMock()
+
+    prefetched = await bot._warm_start()
+
+    assert prefetched == {("room-1", 1): (message, room_info)}
+    bot.wait_until_ready.assert_awaited_once()
+
+
+async def test_warm_start_only_prefetches_first_page(monkeypatch):
+    monkeypatch.setattr("botguette.bot.PINNED_PAGE_SIZE", 2)
+    bot = ArchipelagoBot()
+    room_info = make_room_info()
+    channel = MagicMock()
+    channel.fetch_message = AsyncMock(return_value=make_message(room_info))
+
+    async def iter_pinned_announcements(after=None):
+        for i in range(5):
+            yield PinnedAnnouncement(f"room-{i}", 1, 10 + i, 100, "https://ap-lobby.bananium.fr", False, None, None)
+
+    bot.database.iter_pinned_announcements = iter_pinned_announcements
+    bot.resolver.get_channel = AsyncMock(return_value=channel)
+    bot.lobby_client.get_room_info = AsyncMock(return_value=room_info)
+    bot.wait_until_ready = AsyncMock()
+
+    prefetched = await bot._warm_start()
+
+    assert list(prefetched) == [("room-0", 1), ("room-1", 1)]
+    assert bot.lobby_client.get_room_info.await_count == 2
+
+
+def test_backup_keep_must_be_positive(monkeypatch):
+    monkeypatch.setenv("BACKUP_KEEP", "0")
+    with pytest.raises(ValueError, match="BACKUP_KEEP"):
+        ArchipelagoBot()
+
+
+async def test_refresh_announcement_rename_back_renames_thread():
+    bot = ArchipelagoBot()
+    thread = make_thread("Room A")
+    renamed_thread = make_thread("Room B")
+    thread.id = renamed_thread.id = 1
+    thread.edit.return_value = renamed_thread
+    bot.get_channel = MagicMock(return_value=None)
+    bot.fetch_channel = AsyncMock(return_value=thread)
+    message = make_message(make_room_info(name="Room A"))
+
+    updated = await bot._refresh_announcement(message, make_room_info(name="Room B"), True, 1, 2)
+    assert updated == ["content", "thread_name", "thread_header"]
+
+    message.content = make_content(make_room_info(name="Room B"))
+    updated = await bot._refresh_announcement(message, make_room_info(name="Room A"), True, 1, 2)
+
+    assert updated == ["content", "thread_name", "thread_header"]
+    renamed_thread.edit.assert_awaited_once_with(name="Room A")
+    bot.fetch_channel.assert_awaited_once_with(1)
+
+
+async def test_raw_thread_update_refreshes_fetched_thread():
+    bot = ArchipelagoBot()
+    bot.get_channel = MagicMock(return_value=None)
+    bot.fetch_channel = AsyncMock(return_value=make_thread("Old name"))
+    await bot.resolver.get_channel(10)
+
+    guild = MagicMock()
+    guild.id = 1
+    bot.get_guild = MagicMock(return_value=guild)
+    payload = discord.RawThreadUpdateEvent({
+        "id": "10",
+        "guild_id": "1",
+        "parent_id": "5",
+        "owner_id": "2",
+        "name": "New name",
+        "type": 11,
+        "message_count": 0,
+        "member_count": 0,
+        "rate_limit_per_user": 0,
+        "thread_metadata": {
+            "archived": True,
+            "auto_archive_duration": 1440,
+            "archive_timestamp": "2025-09-20T12:00:00+00:00",
+            "locked": False,
+        },
+    })
+
+    await bot.on_raw_thread_update(payload)
+
+    thread = await bot.resolver.get_channel(10)
+    assert thread.name == "New name"
+    bot.fetch_channel.assert_awaited_once_with(10)
@@ -1,23 +1,3 @@
-import pytest
-import os
-import tempfile
-from botguette.database import Database
-
-
-@pytest.fixture
-async def temp_db():
-    fd, path = tempfile.mkstemp(suffix=".db")
-    os.close(fd)
-
-    db = Database(path)
-    await db.initialize()
-
-    yield db
-
-    if os.path.exists(path):
-        os.unlink(path)
-
-
 async def test_user_ban(temp_db):
     user_id = 123456789
 
@@ -75,3 +55,28 @@ async def test_duplicate_announcement_prevention(temp_db):
     await temp_db.mark_room_announced(room_id, guild_id, user2_id, lobby_url, False)
     info = await temp_db.get_room_announcement_info(room_id, guild_id)
     assert info[0] == user1_id
+
+
+async def test_iter_pinned_announcements_pages(temp_db):
+    lobby_url = "https://ap-lobby.bananium.fr"
+    for i in range(5):
+        await temp_db.mark_room_announced(f"room-{i}", 1, 123, lobby_url, i % 2 == 1, 100 + i, 200, 300 + i, 400 + i)
+    await temp_db.mark_room_announced("room-unpinned", 1, 123, lobby_url, False)
+
+    pins = [pin async for pin in temp_db.iter_pinned_announcements(page_size=2)]
+
+    assert [pin.room_id for pin in pins] == [f"room-{i}" for i in range(5)]
+    assert pins[1].is_async is True
+    assert pins[1].message_id == 101
+    assert pins[1].thread_message_id == 401
+
+
+async def test_iter_pinned_announcements_resumes_after_cursor(temp_db):
+    lobby_url = "https://ap-lobby.bananium.fr"
+    for i in range(3):
+        await temp_db.mark_room_announced(f"room-{i}", 1, 123, lobby_url, False, 100 + i, 200)
+        await temp_db.mark_room_announced(f"room-{i}", 2, 123, lobby_url, False, 500 + i, 200)
+
+    pins = [pin async for pin in temp_db.iter_pinned_announcements(after=("room-1", 1), page_size=2)]
+
+    assert [pin.cursor for pin in pins] == [("room-1", 2), ("room-2", 1), ("room-2", 2)]
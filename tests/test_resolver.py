@@ -0,0 +1,114 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from botguette.resolver import Resolver
+
+
+def make_guild(guild_id, role_names):
+    guild = SimpleNamespace(id=guild_id, roles=[])
+    guild.roles = [SimpleNamespace(id=i, name=name, guild=guild) for i, name in enumerate(role_names)]
+    return guild
+
+
+def make_client(channels=None, fetched=None):
+    channels = channels or {}
+    client = MagicMock()
+    client.get_channel = MagicMock(side_effect=channels.get)
+    client.fetch_channel = AsyncMock(side_effect=lambda channel_id: fetched[channel_id])
+    return client
+
+
+def test_get_role_by_name():
+    guild = make_guild(1, ["@everyone", "Archipelagoer"])
+    resolver = Resolver(make_client())
+
+    assert resolver.get_role(guild, "Archipelagoer") is guild.roles[1]
+    assert resolver.get_role(guild, "Missing") is None
+
+
+def test_get_role_keeps_first_duplicate():
+    guild = make_guild(1, ["Archipelagoer", "Archipelagoer"])
+    resolver = Resolver(make_client())
+
+    assert resolver.get_role(guild, "Archipelagoer") is guild.roles[0]
+
+
+def test_reindex_after_role_changes():
+    guild = make_guild(1, ["Archipelagoer"])
+    resolver = Resolver(make_client())
+    resolver.index_guild(guild)
+
+    guild.roles[0].name = "Renamed"
+    resolver.index_guild(guild)
+
+    assert resolver.get_role(guild, "Archipelagoer") is None
+    assert resolver.get_role(guild, "Renamed") is guild.roles[0]
+
+
+async def test_get_channel_fetches_once():
+    guild = make_guild(1, [])
+    thread = SimpleNamespace(id=10, guild=guild, parent_id=5)
+    client = make_client(fetched={10: thread})
+    resolver = Resolver(client)
+
+    assert await resolver.get_channel(10) is thread
+    assert await resolver.get_channel(10) is thread
+    client.fetch_channel.assert_awaited_once_with(10)
+
+
+async def test_get_channel_shares_concurrent_fetches():
+    guild = make_guild(1, [])
+    thread = SimpleNamespace(id=10, guild=guild, parent_id=5)
+    client = make_client(fetched={10: thread})
+    resolver = Resolver(client)
+
+    channels = await asyncio.gather(*(resolver.get_channel(10) for _ in range(10)))
+
+    assert all(channel is thread for channel in channels)
+    client.fetch_channel.assert_awaited_once_with(10)
+
+
+async def test_get_channel_prefers_client_cache():
+    guild = make_guild(1, [])
+    channel = SimpleNamespace(id=5, guild=guild)
+    client = make_client(channels={5: channel})
+    resolver = Resolver(client)
+
+    assert await resolver.get_channel(5) is channel
+    client.fetch_channel.assert_not_awaited()
+
+
+async def test_update_and_forget_channel():
+    guild = make_guild(1, [])
+    channel = SimpleNamespace(id=5, guild=guild)
+    thread = SimpleNamespace(id=10, guild=guild, parent_id=5)
+    client = make_client(channels={5: channel, 10: thread})
+    resolver = Resolver(client)
+    await resolver.get_channel(5)
+    await resolver.get_channel(10)
+
+    renamed = SimpleNamespace(id=10, guild=guild, parent_id=5)
+    resolver.update_channel(renamed)
+    assert await resolver.get_channel(10) is renamed
+
+    resolver.forget_channel(5)
+    client.get_channel = MagicMock(return_value=None)
+    client.fetch_channel = AsyncMock(return_value=thread)
+    assert await resolver.get_channel(10) is thread
+    client.fetch_channel.assert_awaited_once_with(10)
+
+
+async def test_forget_guild():
+    guild = make_guild(1, ["Archipelagoer"])
+    channel = SimpleNamespace(id=5, guild=guild)
+    client = make_client(channels={5: channel})
+    resolver = Resolver(client)
+    resolver.index_guild(guild)
+    await resolver.get_channel(5)
+
+    resolver.forget_guild(guild)
+
+    fresh_channel = SimpleNamespace(id=5, guild=guild)
+    client.get_channel = MagicMock(return_value=fresh_channel)
+    assert await resolver.get_channel(5) is fresh_channel
+    client.get_channel.assert_called_once_with(5)